@@ -0,0 +1,37 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import os
+from pathlib import Path
+
+from dotenv import dotenv_values
+
+DOTENV_PATH = Path(__file__).parent / ".env"
+
+
+@functools.lru_cache(maxsize=1)
+def load_once() -> dict[str, str | None]:
+    """
+    Load the project's .env file into the environment once per process.
+
+    Variables that are already set take precedence, and empty values are skipped.
+
+    :return: The values parsed from the .env file
+    """
+    values = dotenv_values(DOTENV_PATH)
+    for key, value in values.items():
+        if value:
+            os.environ.setdefault(key, value)
+    return values
@@ -12,58 +12,167 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+import os
 import random
 import uuid
-from locust import HttpUser, task, between
 
+import gevent.pool
+import orjson
+from locust import events, task, between
+from locust.contrib.fasthttp import FastHttpSession, FastHttpUser, insecure_ssl_context_factory
+from locust.runners import MasterRunner, WorkerRunner
 
-class ResearchAgentUser(HttpUser):
+# Imported after locust, which has to gevent-monkey-patch ssl first
+from geventhttpclient.client import HTTPClientPool
+
+_TOPICS = ("artificial intelligence", "climate change", "blockchain")
+_FOCUS_AREAS = ("general", "technical", "business", "social")
+_DOMAINS = ("technology", "business", "science")
+
+# Every (topic, focus, format) message, built once so tasks only pick one.
+# Each combination appears once, matching independent uniform picks of each part.
+_RESEARCH_MESSAGES = tuple(
+    message
+    for topic in _TOPICS
+    for focus in _FOCUS_AREAS
+    for message in (
+        f"Research {topic} with a {focus} focus",
+        f"Can you research {topic} from a {focus} perspective?",
+        f"Tell me about {topic} with a focus on {focus} aspects",
+        f"What can you tell me about {topic}?",
+        f"Explain {topic} in simple terms",
+    )
+)
+
+_TREND_MESSAGES = tuple(
+    message
+    for domain in _DOMAINS
+    for message in (
+        f"Analyze current trends in {domain}",
+        f"What are the emerging trends in {domain}?",
+        f"Tell me about {domain} trends",
+        f"What's happening in the {domain} space?",
+        f"Analyze trends in {domain} research" if domain == "science" else f"What are the latest {domain} developments?",
+    )
+)
+
+# Session state is identical for every user, so serialize it once. ADK's create session
+# endpoint takes the state dict itself as the request body.
+_SESSION_BODY_BYTES = orjson.dumps({"preferred_language": "English", "visit_count": 1})
+
+# One keep-alive pool per Locust process, shared by all users. Connections outlive the
+# users that opened them, so spawn waves reuse sockets instead of leaving closed ones in
+# TIME_WAIT and exhausting client ports. Connections are opened lazily up to the cap.
+_CLIENT_POOL = HTTPClientPool(
+    concurrency=int(os.getenv("LOCUST_CONNECTION_POOL_SIZE", "1000")),
+    network_timeout=10.0,
+    connection_timeout=10.0,
+    ssl_context_factory=insecure_ssl_context_factory,
+    insecure=True,
+)
+
+# (user_id, session_id) pairs created before users spawn and shared by this process's users
+_SHARED_SESSIONS: list[tuple[str, str]] = []
+_USERS_PER_SESSION = 10
+_SESSION_SETUP_CONCURRENCY = 10
+
+
+def _session_url(user_id: str, session_id: str) -> str:
+    return f"/apps/research_agent/users/{user_id}/sessions/{session_id}"
+
+
+@events.test_start.add_listener
+def create_shared_sessions(environment, **kwargs):
+    """Create one session per 10 users up front instead of a burst of creates while users spawn."""
+    _SHARED_SESSIONS.clear()
+    if isinstance(environment.runner, MasterRunner) or not environment.host:
+        return
+    num_users = getattr(environment.parsed_options, "num_users", None)
+    if not num_users:
+        # User count isn't known yet (e.g. web UI); users create their own sessions
+        return
+    if isinstance(environment.runner, WorkerRunner):
+        # num_users is the total across workers. --processes sets expect_workers to the
+        # process count; distributed runs need --expect-workers for an even share.
+        num_users = -(-num_users // max(1, environment.parsed_options.expect_workers))
+
+    client = FastHttpSession(
+        environment, base_url=environment.host, user=None, client_pool=_CLIENT_POOL
+    )
+
+    def create_session(_):
+        user_id, session_id = f"user_{uuid.uuid4()}", f"session_{uuid.uuid4()}"
+        response = client.post(
+            _session_url(user_id, session_id),
+            headers={"Content-Type": "application/json"},
+            data=_SESSION_BODY_BYTES,
+        )
+        if response.status_code == 200:
+            _SHARED_SESSIONS.append((user_id, session_id))
+
+    num_sessions = max(1, num_users // _USERS_PER_SESSION)
+    pool = gevent.pool.Pool(_SESSION_SETUP_CONCURRENCY)
+    pool.map(create_session, range(num_sessions))
+    if len(_SHARED_SESSIONS) < num_sessions:
+        logging.warning(
+            "Created %d of %d shared sessions; %s",
+            len(_SHARED_SESSIONS),
+            num_sessions,
+            "users share the ones created" if _SHARED_SESSIONS else "users create their own",
+        )
+
+
+@events.init.add_listener
+def warn_single_process(environment, **kwargs):
+    """Warn when the load generator is limited to a single CPU core."""
+    options = environment.parsed_options
+    if options is None:
+        return
+    if not (options.processes or options.master or options.worker):
+        logging.warning(
+            "Running Locust in a single process; load generation is capped at one CPU core. "
+            "Use --processes -1 (see run_load.sh) or --master/--worker to scale out."
+        )
+
+
+class ResearchAgentUser(FastHttpUser):
     """Load test user for the Research Agent."""
     
     wait_time = between(1, 3)  # Wait 1-3 seconds between requests
+
+    # Timeouts and concurrency are configured on the shared pool
+    client_pool = _CLIENT_POOL
+    default_headers = {"Connection": "keep-alive"}
     
     def on_start(self):
         """Set up user session when starting."""
-        self.user_id = f"user_{uuid.uuid4()}"
-        self.session_id = f"session_{uuid.uuid4()}"
-        
-        # Create session first  
-        session_data = {"state": {"preferred_language": "English", "visit_count": 1}}
-        
-        self.client.put(
-            f"/apps/research_agent/users/{self.user_id}/sessions/{self.session_id}",
-            headers={"Content-Type": "application/json"},
-            json=session_data,
-        )
+        self._headers = {"Content-Type": "application/json"}
+        self._rng = random.Random()
+
+        if _SHARED_SESSIONS:
+            self.user_id, self.session_id = self._rng.choice(_SHARED_SESSIONS)
+        else:
+            # No shared pool (setup failed or user count unknown), so create a session
+            self.user_id = f"user_{uuid.uuid4()}"
+            self.session_id = f"session_{uuid.uuid4()}"
+            self.client.post(
+                _session_url(self.user_id, self.session_id),
+                headers=self._headers,
+                data=_SESSION_BODY_BYTES,
+            )
+
+        # Build the per-user URL once instead of on every task
+        self.conversations_url = f"/apps/research_agent/users/{self.user_id}/conversations"
 
     @task(3)
     def research_topics(self):
         """Test researching various topics with different focus areas."""
-        # Random topic and focus selection
-        topics = ["artificial intelligence", "climate change", "blockchain"]
-        focus_areas = ["general", "technical", "business", "social"]
-        
-        topic = random.choice(topics)
-        focus = random.choice(focus_areas)
-        
-        # Vary the message format
-        message_formats = [
-            f"Research {topic} with a {focus} focus",
-            f"Can you research {topic} from a {focus} perspective?",
-            f"Tell me about {topic} with a focus on {focus} aspects",
-            f"What can you tell me about {topic}?",
-            f"Explain {topic} in simple terms"
-        ]
-        
-        message_data = {
-            "message": random.choice(message_formats),
-            "session_id": self.session_id,
-        }
-        
+        # Random topic, focus and message format in a single pick
         response = self.client.post(
-            f"/apps/research_agent/users/{self.user_id}/conversations",
-            headers={"Content-Type": "application/json"},
-            json=message_data,
+            self.conversations_url,
+            headers=self._headers,
+            json={"message": self._rng.choice(_RESEARCH_MESSAGES), "session_id": self.session_id},
         )
         
         if response.status_code == 200:
@@ -75,27 +184,11 @@ class ResearchAgentUser(HttpUser):
     @task(2)
     def analyze_trends(self):
         """Test trend analysis across different domains."""
-        # Random domain selection and varied message formats
-        domains = ["technology", "business", "science"]
-        domain = random.choice(domains)
-        
-        message_formats = [
-            f"Analyze current trends in {domain}",
-            f"What are the emerging trends in {domain}?",
-            f"Tell me about {domain} trends",
-            f"What's happening in the {domain} space?",
-            f"Analyze trends in {domain} research" if domain == "science" else f"What are the latest {domain} developments?"
-        ]
-        
-        message_data = {
-            "message": random.choice(message_formats),
-            "session_id": self.session_id,
-        }
-        
+        # Random domain and message format in a single pick
         self.client.post(
-            f"/apps/research_agent/users/{self.user_id}/conversations",
-            headers={"Content-Type": "application/json"},
-            json=message_data,
+            self.conversations_url,
+            headers=self._headers,
+            json={"message": self._rng.choice(_TREND_MESSAGES), "session_id": self.session_id},
         )
 
     def on_stop(self):
@@ -103,7 +196,7 @@ class ResearchAgentUser(HttpUser):
         # Optionally submit feedback
         if hasattr(self, 'conversation_id'):
             feedback_data = {
-                "score": random.randint(3, 5),
+                "score": self._rng.randint(3, 5),
                 "text": "Load test feedback",
                 "invocation_id": self.conversation_id,
                 "user_id": self.user_id
@@ -111,6 +204,6 @@ class ResearchAgentUser(HttpUser):
             
             self.client.post(
                 "/feedback",
-                headers={"Content-Type": "application/json"},
+                headers=self._headers,
                 json=feedback_data,
             ) 
\ No newline at end of file
@@ -12,27 +12,158 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
 import os
-from pathlib import Path
+import random
 
 import google.auth
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.cloud import logging as google_cloud_logging
+from google.cloud.logging.handlers import CloudLoggingHandler
+from google.cloud.logging.handlers.transports import BackgroundThreadTransport
 
-# Load environment variables from .env file in root directory
-root_dir = Path(__file__).parent.parent
-dotenv_path = root_dir / ".env"
-load_dotenv(dotenv_path=dotenv_path)
+from _env import load_once
 
-# Use default project from credentials if not in .env
-_, project_id = google.auth.default()
-os.environ.setdefault("GOOGLE_CLOUD_PROJECT", project_id)
+# Load environment variables from .env file in root directory
+load_once()
+
+# Use default project from credentials if not in .env; only look it up when needed
+# since resolving credentials can hit the metadata server
+if not os.environ.get("GOOGLE_CLOUD_PROJECT"):
+    _, project_id = google.auth.default()
+    if project_id:
+        os.environ["GOOGLE_CLOUD_PROJECT"] = project_id
 os.environ.setdefault("GOOGLE_CLOUD_LOCATION", "global")
 os.environ.setdefault("GOOGLE_GENAI_USE_VERTEXAI", "True")
 
-logging_client = google_cloud_logging.Client()
-logger = logging_client.logger("researcher-agent")
+# Fraction of tool calls that are logged; tool calls sit on the request path
+_TOOL_LOG_SAMPLE = float(os.getenv("TOOL_LOG_SAMPLE", "0.01"))
+
+_logger = None
+
+
+def _get_logger() -> logging.Logger:
+    """Returns the tool logger, creating its Cloud Logging client on first use.
+
+    Records are shipped from a background thread so logging never blocks a tool call.
+    """
+    global _logger
+    if _logger is None:
+        handler = CloudLoggingHandler(
+            google_cloud_logging.Client(),
+            name="researcher-agent",
+            transport=BackgroundThreadTransport,
+        )
+        _logger = logging.getLogger("researcher-agent")
+        _logger.setLevel(logging.INFO)
+        _logger.addHandler(handler)
+        _logger.propagate = False
+    return _logger
+
+
+# Knowledge base for various topics
+_KNOWLEDGE_BASE = {
+    "artificial intelligence": {
+        "general": "AI is a rapidly evolving field focused on creating machines that can perform tasks typically requiring human intelligence. Key areas include machine learning, natural language processing, computer vision, and robotics. Current trends show significant advancement in large language models, generative AI, and autonomous systems.",
+        "technical": "AI encompasses various approaches including supervised/unsupervised learning, neural networks, deep learning architectures (CNNs, RNNs, Transformers), reinforcement learning, and symbolic AI. Modern architectures like attention mechanisms and transformer models have revolutionized NLP and multimodal applications.",
+        "business": "AI is transforming industries through automation, predictive analytics, personalized experiences, and decision support systems. Companies are investing heavily in AI infrastructure, talent acquisition, and ethical AI practices. Key challenges include ROI measurement, data quality, and integration complexity.",
+        "social": "AI raises important questions about job displacement, privacy, bias in algorithms, and the future of human-machine collaboration. Discussions focus on AI governance, ethical frameworks, transparency, and ensuring AI benefits society broadly."
+    },
+    "climate change": {
+        "general": "Climate change refers to long-term shifts in global temperatures and weather patterns, primarily driven by human activities since the Industrial Revolution. Key indicators include rising global temperatures, melting ice caps, sea level rise, and extreme weather events.",
+        "technical": "Climate science involves understanding greenhouse gas emissions (CO2, CH4, N2O), feedback loops, climate modeling, and mitigation technologies. Solutions include renewable energy systems, carbon capture, energy efficiency, and sustainable transportation technologies.",
+        "business": "Climate change presents both risks and opportunities for businesses. Companies are adopting sustainability practices, ESG reporting, carbon accounting, and climate risk assessments. Green finance and sustainable business models are becoming competitive advantages.",
+        "social": "Climate change disproportionately affects vulnerable populations and raises questions of climate justice, adaptation strategies, and international cooperation. Social movements and policy advocacy play crucial roles in driving climate action."
+    },
+    "blockchain": {  
+        "general": "Blockchain is a distributed ledger technology that maintains a continuously growing list of records, linked and secured using cryptography. It enables decentralized, transparent, and immutable record-keeping without requiring a central authority.",
+        "technical": "Blockchain systems use cryptographic hashing, consensus mechanisms (Proof of Work, Proof of Stake), smart contracts, and distributed networks. Key technical challenges include scalability, energy consumption, and interoperability between different blockchain networks.",
+        "business": "Blockchain applications span cryptocurrency, supply chain management, digital identity, decentralized finance (DeFi), and non-fungible tokens (NFTs). Businesses are exploring blockchain for transparency, reducing intermediaries, and creating new business models.",
+        "social": "Blockchain raises questions about financial inclusion, regulatory frameworks, energy consumption, and the decentralization of traditional institutions. It has potential to increase transparency and reduce corruption in various sectors."
+    }
+}
+
+# Trend analysis for supported domains
+_TREND_ANALYSIS = {
+    "technology": {
+        "key_trends": [
+            "Generative AI and Large Language Models",
+            "Edge Computing and IoT Integration", 
+            "Quantum Computing Development",
+            "Sustainable Technology Solutions",
+            "Extended Reality (AR/VR/MR)"
+        ],
+        "emerging_patterns": "Technology is moving toward more distributed, intelligent, and sustainable solutions. AI integration is becoming ubiquitous across all tech sectors.",
+        "future_outlook": "Continued convergence of AI, cloud computing, and sustainable practices will shape the next decade of technological development."
+    },
+    "business": {
+        "key_trends": [
+            "Digital Transformation Acceleration",
+            "Remote and Hybrid Work Models",
+            "ESG and Sustainability Focus",
+            "Customer Experience Personalization",
+            "Data-Driven Decision Making"
+        ],
+        "emerging_patterns": "Businesses are prioritizing agility, sustainability, and customer-centricity while leveraging technology for competitive advantage.",
+        "future_outlook": "Organizations that successfully balance human-centered approaches with technological innovation will lead market transformations."
+    },
+    "science": {
+        "key_trends": [
+            "Interdisciplinary Research Collaboration",
+            "AI-Assisted Scientific Discovery",
+            "Open Science and Data Sharing",
+            "Climate Science and Environmental Research",
+            "Precision Medicine and Biotechnology"
+        ],
+        "emerging_patterns": "Scientific research is becoming more collaborative, data-intensive, and focused on addressing global challenges.",
+        "future_outlook": "Integration of AI tools with traditional scientific methods will accelerate discovery and innovation across all fields."
+    }
+}
+
+_AVAILABLE_TOPICS_MSG = "Available topics include: " + ", ".join(_KNOWLEDGE_BASE) + "."
+_AVAILABLE_DOMAINS_MSG = "Available domains: " + ", ".join(_TREND_ANALYSIS) + "."
+
+
+def _make_research_response(topic: str, focus_area: str, insights: str) -> dict:
+    """Builds a successful research_topic response."""
+    return {
+        "status": "success",
+        "research": {
+            "topic": topic,
+            "focus_area": focus_area,
+            "insights": insights,
+            "methodology": "Analysis based on existing knowledge base",
+            "last_updated": "Knowledge current as of training data"
+        }
+    }
+
+
+def _make_trend_response(domain: str, analysis: dict) -> dict:
+    """Builds a successful analyze_trends response."""
+    return {
+        "status": "success",
+        "analysis": analysis,
+        "domain": domain,
+        "analysis_date": "Based on current knowledge patterns"
+    }
+
+
+# Prebuilt tool responses keyed by normalized inputs, so each call is a single lookup.
+# They are shared between calls and must not be mutated. ADK needs tools to return a
+# dict, so responses stay dicts rather than pre-serialized JSON.
+_RESEARCH_RESPONSES = {
+    (topic, focus): _make_research_response(topic, focus, insights)
+    for topic, focuses in _KNOWLEDGE_BASE.items()
+    for focus, insights in focuses.items()
+}
+# Default to general if specific focus not found
+for _topic in _KNOWLEDGE_BASE:
+    _RESEARCH_RESPONSES[(_topic, None)] = _RESEARCH_RESPONSES[(_topic, "general")]
+
+_TREND_RESPONSES = {
+    domain: _make_trend_response(domain, analysis)
+    for domain, analysis in _TREND_ANALYSIS.items()
+}
 
 
 def research_topic(topic: str, focus_area: str = "general") -> dict:
@@ -48,59 +179,21 @@ def research_topic(topic: str, focus_area: str = "general") -> dict:
               If 'success', includes a 'research' key with detailed insights.
               If 'error', includes an 'error_message' key.
     """
-    logger.log_text(
-        f"--- Tool: research_topic called for topic: {topic}, focus: {focus_area} ---", severity="INFO"
-    )
-    
-    topic_normalized = topic.lower().strip()
-    focus_normalized = focus_area.lower().strip()
-
-    # Knowledge base for various topics
-    knowledge_base = {
-        "artificial intelligence": {
-            "general": "AI is a rapidly evolving field focused on creating machines that can perform tasks typically requiring human intelligence. Key areas include machine learning, natural language processing, computer vision, and robotics. Current trends show significant advancement in large language models, generative AI, and autonomous systems.",
-            "technical": "AI encompasses various approaches including supervised/unsupervised learning, neural networks, deep learning architectures (CNNs, RNNs, Transformers), reinforcement learning, and symbolic AI. Modern architectures like attention mechanisms and transformer models have revolutionized NLP and multimodal applications.",
-            "business": "AI is transforming industries through automation, predictive analytics, personalized experiences, and decision support systems. Companies are investing heavily in AI infrastructure, talent acquisition, and ethical AI practices. Key challenges include ROI measurement, data quality, and integration complexity.",
-            "social": "AI raises important questions about job displacement, privacy, bias in algorithms, and the future of human-machine collaboration. Discussions focus on AI governance, ethical frameworks, transparency, and ensuring AI benefits society broadly."
-        },
-        "climate change": {
-            "general": "Climate change refers to long-term shifts in global temperatures and weather patterns, primarily driven by human activities since the Industrial Revolution. Key indicators include rising global temperatures, melting ice caps, sea level rise, and extreme weather events.",
-            "technical": "Climate science involves understanding greenhouse gas emissions (CO2, CH4, N2O), feedback loops, climate modeling, and mitigation technologies. Solutions include renewable energy systems, carbon capture, energy efficiency, and sustainable transportation technologies.",
-            "business": "Climate change presents both risks and opportunities for businesses. Companies are adopting sustainability practices, ESG reporting, carbon accounting, and climate risk assessments. Green finance and sustainable business models are becoming competitive advantages.",
-            "social": "Climate change disproportionately affects vulnerable populations and raises questions of climate justice, adaptation strategies, and international cooperation. Social movements and policy advocacy play crucial roles in driving climate action."
-        },
-        "blockchain": {  
-            "general": "Blockchain is a distributed ledger technology that maintains a continuously growing list of records, linked and secured using cryptography. It enables decentralized, transparent, and immutable record-keeping without requiring a central authority.",
-            "technical": "Blockchain systems use cryptographic hashing, consensus mechanisms (Proof of Work, Proof of Stake), smart contracts, and distributed networks. Key technical challenges include scalability, energy consumption, and interoperability between different blockchain networks.",
-            "business": "Blockchain applications span cryptocurrency, supply chain management, digital identity, decentralized finance (DeFi), and non-fungible tokens (NFTs). Businesses are exploring blockchain for transparency, reducing intermediaries, and creating new business models.",
-            "social": "Blockchain raises questions about financial inclusion, regulatory frameworks, energy consumption, and the decentralization of traditional institutions. It has potential to increase transparency and reduce corruption in various sectors."
-        }
-    }
+    if random.random() < _TOOL_LOG_SAMPLE:
+        _get_logger().info(
+            f"--- Tool: research_topic called for topic: {topic}, focus: {focus_area} ---"
+        )
 
-    # Check if topic exists in knowledge base
-    if topic_normalized in knowledge_base:
-        topic_data = knowledge_base[topic_normalized]
-        if focus_normalized in topic_data:
-            research_content = topic_data[focus_normalized]
-        else:
-            # Default to general if specific focus not found
-            research_content = topic_data.get("general", "Limited information available for this focus area.")
-        
-        return {
-            "status": "success",
-            "research": {
-                "topic": topic,
-                "focus_area": focus_area,
-                "insights": research_content,
-                "methodology": "Analysis based on existing knowledge base",
-                "last_updated": "Knowledge current as of training data"
-            }
-        }
-    else:
+    topic_normalized = topic.lower().strip()
+    response = _RESEARCH_RESPONSES.get(
+        (topic_normalized, focus_area.lower().strip())
+    ) or _RESEARCH_RESPONSES.get((topic_normalized, None))
+    if response is None:
         return {
             "status": "error",
-            "error_message": f"Sorry, I don't have comprehensive research data for '{topic}'. Available topics include: artificial intelligence, climate change, blockchain."
+            "error_message": f"Sorry, I don't have comprehensive research data for '{topic}'. {_AVAILABLE_TOPICS_MSG}"
         }
+    return response
 
 
 def analyze_trends(domain: str) -> dict:
@@ -112,60 +205,16 @@ def analyze_trends(domain: str) -> dict:
     Returns:
         dict: A dictionary containing trend analysis.
     """
-    logger.log_text(
-        f"--- Tool: analyze_trends called for domain: {domain} ---", severity="INFO"
-    )
-    
-    domain_normalized = domain.lower().strip()
-    
-    trend_analysis = {
-        "technology": {
-            "key_trends": [
-                "Generative AI and Large Language Models",
-                "Edge Computing and IoT Integration", 
-                "Quantum Computing Development",
-                "Sustainable Technology Solutions",
-                "Extended Reality (AR/VR/MR)"
-            ],
-            "emerging_patterns": "Technology is moving toward more distributed, intelligent, and sustainable solutions. AI integration is becoming ubiquitous across all tech sectors.",
-            "future_outlook": "Continued convergence of AI, cloud computing, and sustainable practices will shape the next decade of technological development."
-        },
-        "business": {
-            "key_trends": [
-                "Digital Transformation Acceleration",
-                "Remote and Hybrid Work Models",
-                "ESG and Sustainability Focus",
-                "Customer Experience Personalization",
-                "Data-Driven Decision Making"
-            ],
-            "emerging_patterns": "Businesses are prioritizing agility, sustainability, and customer-centricity while leveraging technology for competitive advantage.",
-            "future_outlook": "Organizations that successfully balance human-centered approaches with technological innovation will lead market transformations."
-        },
-        "science": {
-            "key_trends": [
-                "Interdisciplinary Research Collaboration",
-                "AI-Assisted Scientific Discovery",
-                "Open Science and Data Sharing",
-                "Climate Science and Environmental Research",
-                "Precision Medicine and Biotechnology"
-            ],
-            "emerging_patterns": "Scientific research is becoming more collaborative, data-intensive, and focused on addressing global challenges.",
-            "future_outlook": "Integration of AI tools with traditional scientific methods will accelerate discovery and innovation across all fields."
-        }
-    }
-    
-    if domain_normalized in trend_analysis:
-        return {
-            "status": "success",
-            "analysis": trend_analysis[domain_normalized],
-            "domain": domain,
-            "analysis_date": "Based on current knowledge patterns"
-        }
-    else:
+    if random.random() < _TOOL_LOG_SAMPLE:
+        _get_logger().info(f"--- Tool: analyze_trends called for domain: {domain} ---")
+
+    response = _TREND_RESPONSES.get(domain.lower().strip())
+    if response is None:
         return {
             "status": "error",
-            "error_message": f"Sorry, trend analysis not available for '{domain}'. Available domains: technology, business, science."
+            "error_message": f"Sorry, trend analysis not available for '{domain}'. {_AVAILABLE_DOMAINS_MSG}"
         }
+    return response
 
 
 root_agent = Agent(
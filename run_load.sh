@@ -0,0 +1,38 @@
+#!/usr/bin/env bash
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Run the load test with one Locust worker process per CPU core.
+# Usage: ./run_load.sh {YOUR_CLOUD_RUN_SERVICE_URL} [extra locust args...]
+
+set -euo pipefail
+
+if [ $# -lt 1 ]; then
+  echo "Usage: $0 <host> [extra locust args...]" >&2
+  exit 1
+fi
+
+HOST="$1"
+shift
+
+mkdir -p .results
+
+locust -f load_test.py \
+  -H "$HOST" \
+  --processes -1 \
+  --headless \
+  -u 500 -r 50 -t 5m \
+  --csv=.results/results \
+  --html=.results/report.html \
+  "$@"
@@ -12,38 +12,96 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import logging
 import os
+import re
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
-from dotenv import load_dotenv
-from fastapi import FastAPI
+import msgspec
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from google.adk.cli.fast_api import get_fast_api_app
-from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from typing import Literal
 from google.cloud import logging as google_cloud_logging
+from _env import load_once
 from tracing import CloudTraceLoggingSpanExporter
 from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider, export
 
 
 # Load environment variables from .env file
-load_dotenv()
+load_once()
+
+_logging_client = None
+_logging_client_lock = threading.Lock()
+_logger = None
+
+
+def _get_logging_client() -> google_cloud_logging.Client:
+    """Returns the Cloud Logging client shared with the span exporter, created on first use.
+
+    Creating the client resolves credentials, so it is kept out of import time.
+    """
+    global _logging_client
+    # The span export thread and request threads can both ask for it first
+    with _logging_client_lock:
+        if _logging_client is None:
+            _logging_client = google_cloud_logging.Client()
+    return _logging_client
+
+
+def _get_logger() -> google_cloud_logging.Logger:
+    """Returns the server logger, creating its Cloud Logging client on first use."""
+    global _logger
+    if _logger is None:
+        _logger = _get_logging_client().logger(__name__)
+    return _logger
+
+
+def _log_startup() -> None:
+    """Logs the session service in use once the server starts."""
+    _get_logger().log_text(
+        "Using in-memory session service. Sessions will be lost when the server restarts. "
+        "This is suitable for stateless research operations.",
+        severity="INFO",
+    )
+
+
+def _report_startup_log_error(startup_log: asyncio.Future) -> None:
+    """Logs why the startup log message could not be sent, as soon as it fails."""
+    if not startup_log.cancelled() and startup_log.exception() is not None:
+        logging.error("Failed to send startup log message", exc_info=startup_log.exception())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Sends the startup log message in the background while the server starts."""
+    # Log from a worker thread without waiting on it, so startup doesn't block on the RPC
+    startup_log = asyncio.ensure_future(run_in_threadpool(_log_startup))
+    startup_log.add_done_callback(_report_startup_log_error)
+    yield
+    # Don't hold up shutdown on a slow or hung RPC
+    startup_log.cancel()
 
-logging_client = google_cloud_logging.Client()
-logger = logging_client.logger(__name__)
 
 AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Simplified app arguments - using in-memory session service
-app_args = {"agents_dir": AGENT_DIR, "web": True}
-
-logger.log_text(
-    "Using in-memory session service. Sessions will be lost when the server restarts. "
-    "This is suitable for stateless research operations.",
-    severity="INFO",
-)
+app_args = {"agents_dir": AGENT_DIR, "web": True, "lifespan": lifespan}
 
 provider = TracerProvider()
-processor = export.BatchSpanProcessor(CloudTraceLoggingSpanExporter())
+processor = export.BatchSpanProcessor(
+    CloudTraceLoggingSpanExporter(
+        project_id=os.environ.get("GOOGLE_CLOUD_PROJECT"),
+        logging_client_factory=_get_logging_client,
+    )
+)
 provider.add_span_processor(processor)
 trace.set_tracer_provider(provider)
 
@@ -54,7 +112,7 @@ app.title = "researcher-agent"
 app.description = "API for interacting with the Researcher Agent"
 
 
-class Feedback(BaseModel):
+class Feedback(msgspec.Struct, kw_only=True):
     """Represents feedback for a conversation."""
 
     score: int | float
@@ -65,22 +123,158 @@ class Feedback(BaseModel):
     user_id: str = ""
 
 
-@app.post("/feedback")
-def collect_feedback(feedback: Feedback) -> dict[str, str]:
+# strict=False coerces numeric strings such as "4" the way the Pydantic model did
+_FEEDBACK_DECODER = msgspec.json.Decoder(Feedback, strict=False)
+_FEEDBACK_SCHEMA = msgspec.json.schema_components([Feedback])[1]["Feedback"]
+_MSGSPEC_ERROR = re.compile(r"^(?P<msg>.*?)(?: - at `\$(?P<path>[^`]*)`)?$")
+_MISSING_FIELD = re.compile(r"^Object missing required field `(?P<field>[^`]+)`$")
+
+
+def _feedback_errors(error: msgspec.DecodeError) -> list[dict]:
+    """Convert a msgspec decode error into FastAPI's request validation error list.
+
+    Args:
+        error: The error raised while decoding the feedback body
+
+    Returns:
+        Errors in the shape FastAPI returns under "detail"
+    """
+    if not isinstance(error, msgspec.ValidationError):
+        return [{"type": "json_invalid", "loc": ["body"], "msg": "JSON decode error", "ctx": {"error": str(error)}}]
+
+    match = _MSGSPEC_ERROR.match(str(error))
+    loc: list[str | int] = ["body"]
+    for name, index in re.findall(r"\.([^.\[]+)|\[(\d+)\]", match["path"] or ""):
+        loc.append(name or int(index))
+    missing = _MISSING_FIELD.match(match["msg"])
+    if missing:
+        return [{"type": "missing", "loc": [*loc, missing["field"]], "msg": "Field required"}]
+    return [{"type": "value_error", "loc": loc, "msg": match["msg"]}]
+
+
+@app.post(
+    "/feedback",
+    response_class=ORJSONResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _FEEDBACK_SCHEMA}},
+        }
+    },
+)
+async def collect_feedback(request: Request) -> dict[str, str]:
     """Collect and log feedback.
 
     Args:
-        feedback: The feedback data to log
+        request: The request whose JSON body is the feedback data to log
 
     Returns:
         Success message
     """
-    logger.log_struct(feedback.model_dump(), severity="INFO")
+    try:
+        feedback = _FEEDBACK_DECODER.decode(await request.body())
+    except msgspec.DecodeError as e:
+        raise RequestValidationError(_feedback_errors(e)) from e
+    await log_feedback(feedback)
     return {"status": "success"}
 
 
+async def log_feedback(feedback: Feedback) -> None:
+    """Log feedback to Cloud Logging.
+
+    Args:
+        feedback: The feedback data to log
+    """
+    # log_struct is a blocking RPC and the first call creates the client, so keep it off the event loop
+    await run_in_threadpool(_log_struct, msgspec.to_builtins(feedback))
+
+
+def _log_struct(info: dict) -> None:
+    """Logs a structured entry at INFO severity."""
+    _get_logger().log_struct(info, severity="INFO")
+
+
+class FeedbackFastPathMiddleware:
+    """Serves small, valid /feedback posts before FastAPI routing runs.
+
+    This is a plain ASGI middleware so every other request passes straight through.
+    Larger, chunked or invalid payloads fall through to the /feedback route.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int = 2048) -> None:
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["path"] != "/feedback"
+            or scope["method"] != "POST"
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            content_length = int(dict(scope["headers"])[b"content-length"])
+        except (KeyError, ValueError):
+            # Chunked or malformed length; let the app handle the request as usual
+            content_length = None
+        if content_length is None or content_length > self.max_body_size:
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                # Client disconnected before sending the whole body
+                return
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        try:
+            feedback = _FEEDBACK_DECODER.decode(body)
+        except msgspec.DecodeError:
+            await self.app(scope, self._replay(body, receive), send)
+            return
+
+        await log_feedback(feedback)
+        await ORJSONResponse({"status": "success"})(scope, receive, send)
+
+    @staticmethod
+    def _replay(body: bytes, receive: Receive) -> Receive:
+        """Returns a receive callable that yields the already-read body once."""
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return replay
+
+
+app.add_middleware(FeedbackFastPathMiddleware)
+
+
 # Main execution
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    # Sessions live in each worker's memory, so only raise WEB_CONCURRENCY above 1
+    # when requests for a session are guaranteed to reach the same worker.
+    # loop/http "auto" pick uvloop and httptools when they are installed.
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    # Workers need an import string, but a single process serves this module's app
+    # directly so the module isn't imported and set up a second time as "server".
+    uvicorn.run(
+        app if workers == 1 else "server:app",
+        host="0.0.0.0",
+        port=8080,
+        workers=workers,
+        loop="auto",
+        http="auto",
+    )
@@ -0,0 +1,146 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import threading
+import time
+from unittest import mock
+
+import google.auth
+import pytest
+from fastapi.testclient import TestClient
+from starlette.responses import PlainTextResponse
+
+# With the project known, importing the server must not resolve credentials
+os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "test-project")
+with mock.patch.object(google.auth, "default", side_effect=AssertionError("credentials resolved")):
+    import server
+
+
+@pytest.fixture
+def logged(monkeypatch) -> list[dict]:
+    """Captures feedback entries instead of sending them to Cloud Logging."""
+    entries: list[dict] = []
+    monkeypatch.setattr(server, "_log_struct", entries.append)
+    return entries
+
+
+@pytest.fixture
+def inner_calls() -> list[bytes]:
+    return []
+
+
+@pytest.fixture
+def fast_path_client(inner_calls) -> TestClient:
+    """A client for the fast path middleware wrapped around an app that records what reaches it."""
+
+    async def inner(scope, receive, send):
+        message = await receive()
+        inner_calls.append(message.get("body", b""))
+        await PlainTextResponse("inner")(scope, receive, send)
+
+    return TestClient(server.FeedbackFastPathMiddleware(inner))
+
+
+def test_fast_path_serves_valid_feedback(fast_path_client, inner_calls, logged):
+    response = fast_path_client.post("/feedback", json={"score": 5, "invocation_id": "abc"})
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "success"}
+    assert inner_calls == []
+    assert logged[0]["invocation_id"] == "abc"
+
+
+def test_fast_path_replays_invalid_body(fast_path_client, inner_calls, logged):
+    response = fast_path_client.post(
+        "/feedback", content=b'{"score": 5}', headers={"Content-Type": "application/json"}
+    )
+
+    assert response.text == "inner"
+    assert inner_calls == [b'{"score": 5}']
+    assert logged == []
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-"])
+def test_fast_path_falls_through_on_malformed_content_length(
+    fast_path_client, inner_calls, logged, content_length
+):
+    response = fast_path_client.post(
+        "/feedback",
+        content=b'{"score": 5, "invocation_id": "abc"}',
+        headers={"Content-Length": content_length},
+    )
+
+    assert response.text == "inner"
+    assert len(inner_calls) == 1
+    assert logged == []
+
+
+def test_fast_path_ignores_other_routes(fast_path_client, inner_calls):
+    assert fast_path_client.post("/other", json={}).text == "inner"
+    assert fast_path_client.get("/feedback").text == "inner"
+
+
+def test_invalid_feedback_gets_route_validation_error(logged):
+    response = TestClient(server.app).post("/feedback", json={"score": 5})
+
+    assert response.status_code == 422
+    assert response.json() == {
+        "detail": [{"type": "missing", "loc": ["body", "invocation_id"], "msg": "Field required"}]
+    }
+    assert logged == []
+
+
+def test_feedback_coerces_numeric_strings(logged):
+    response = TestClient(server.app).post("/feedback", json={"score": "4", "invocation_id": "abc"})
+
+    assert response.status_code == 200
+    assert logged[0]["score"] == 4
+
+
+def test_large_feedback_is_served_by_route(logged):
+    text = "x" * 4096
+    response = TestClient(server.app).post(
+        "/feedback", json={"score": 5, "invocation_id": "abc", "text": text}
+    )
+
+    assert response.status_code == 200
+    assert logged[0]["text"] == text
+
+
+def test_startup_log_failure_is_logged(monkeypatch, caplog):
+    def fail():
+        raise RuntimeError("no credentials")
+
+    monkeypatch.setattr(server, "_log_startup", fail)
+    with caplog.at_level(logging.ERROR), TestClient(server.app):
+        deadline = time.monotonic() + 5
+        while not caplog.records and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert "Failed to send startup log message" in caplog.text
+    assert "no credentials" in caplog.text
+
+
+def test_shutdown_does_not_wait_for_startup_log(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(server, "_log_startup", release.wait)
+    try:
+        started = time.monotonic()
+        with TestClient(server.app):
+            pass
+        assert time.monotonic() - started < 5
+    finally:
+        release.set()
@@ -0,0 +1,152 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import orjson
+import pytest
+from opentelemetry import trace as trace_api
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import Link, SpanContext, SpanKind, Status, StatusCode, TraceFlags, TraceState
+
+from tracing import TRUNC_SUFFIX, CloudTraceLoggingSpanExporter
+
+MAX_SIZE = 200 * 1024
+
+
+@pytest.fixture
+def exporter() -> CloudTraceLoggingSpanExporter:
+    return CloudTraceLoggingSpanExporter(project_id="test-project")
+
+
+def _truncate_like_full_serialization(attributes: dict) -> dict:
+    """The size guard's contract: truncate large strings whenever the JSON payload is over 200 KB."""
+    if len(orjson.dumps(attributes)) <= MAX_SIZE:
+        return attributes
+    return {
+        key: value[:9900] + TRUNC_SUFFIX
+        if isinstance(value, str) and len(value.encode()) > 10000
+        else value
+        for key, value in attributes.items()
+    }
+
+
+@pytest.mark.parametrize(
+    "attributes",
+    [
+        pytest.param({"a": "x" * 1000, "n": 1, "f": 1.5, "b": True, "z": None}, id="small"),
+        pytest.param({"a": '"' * 100_000}, id="quotes-under-limit"),
+        pytest.param({"a": '"' * 60_000, "b": "\\" * 50_000}, id="escapes-over-limit"),
+        pytest.param({"a": "\x01" * 40_000}, id="control-characters"),
+        pytest.param({"a": "line\n" * 10_000, "b": "tab\t" * 10_000}, id="newlines-and-tabs"),
+        pytest.param({"a": "é" * 60_000}, id="two-byte-utf8"),
+        pytest.param({"a": "日本" * 20_000, "b": "x" * 80_000}, id="three-byte-utf8"),
+        pytest.param({"a": "😀" * 30_000}, id="four-byte-utf8"),
+        pytest.param({"a": ["x" * 5000] * 50, "b": "y" * 20_000}, id="sequence-over-limit"),
+        pytest.param({"a": ['"' * 1000] * 10}, id="sequence-under-limit"),
+        pytest.param({f"k{i}": "v" * 9000 for i in range(30)}, id="many-values"),
+    ],
+)
+def test_size_guard_truncates_every_oversized_payload(exporter, attributes):
+    expected = _truncate_like_full_serialization(attributes)
+
+    span_dict = exporter._process_large_attributes({"attributes": dict(attributes)})
+
+    assert span_dict["attributes"] == expected
+
+
+@pytest.mark.parametrize("attributes", [None, {}])
+def test_size_guard_skips_spans_without_attributes(exporter, attributes):
+    assert exporter._process_large_attributes({"attributes": attributes}) == {"attributes": attributes}
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "a" * 10_000,
+        "a" * 10_001,
+        "é" * 2500,
+        "é" * 5000,
+        "é" * 5001,
+        "日" * 3333,
+        "日" * 3334,
+        "😀" * 2500,
+        "😀" * 2501,
+        "a" * 9999 + "é",
+    ],
+)
+def test_attribute_limit_matches_encoded_size(value):
+    assert CloudTraceLoggingSpanExporter._exceeds_attribute_limit(value) == (len(value.encode()) > 10_000)
+
+
+def _record_spans(resource: Resource) -> tuple[ReadableSpan, ...]:
+    """Finishes a few representative spans with the OpenTelemetry SDK and returns them."""
+    memory = InMemorySpanExporter()
+    provider = TracerProvider(resource=resource)
+    provider.add_span_processor(SimpleSpanProcessor(memory))
+    tracer = provider.get_tracer(__name__)
+
+    linked = SpanContext(
+        trace_id=0x00F067AA0BA902B7_4BF92F3577B34DA6,
+        span_id=0x00F067AA0BA902B7,
+        is_remote=True,
+        trace_flags=TraceFlags(TraceFlags.SAMPLED),
+        trace_state=TraceState([("vendor", "value")]),
+    )
+    with tracer.start_as_current_span(
+        "root",
+        kind=SpanKind.SERVER,
+        attributes={"str": "value", "int": 1, "float": 1.5, "bool": True, "seq": ("a", "b")},
+    ) as root:
+        root.add_event("event", {"count": 2, "tags": [1, 2]})
+        root.add_event("bare")
+        with tracer.start_as_current_span("child", links=[Link(linked, {"why": "retry"}), Link(linked)]):
+            pass
+        with tracer.start_as_current_span("failed", record_exception=False) as failed:
+            failed.record_exception(ValueError("boom"))
+            failed.set_status(Status(StatusCode.ERROR, "boom"))
+        with tracer.start_as_current_span("ok") as ok:
+            ok.set_status(Status(StatusCode.OK))
+    provider.shutdown()
+    return memory.get_finished_spans()
+
+
+def test_span_to_dict_matches_to_json(exporter):
+    spans = (
+        *_record_spans(Resource.create({"service.name": "researcher-agent"})),
+        *_record_spans(Resource.create({"service.name": "other", "deployment": "test"})),
+    )
+    assert len(spans) == 8
+
+    for span in spans:
+        assert exporter._span_to_dict(span) == json.loads(span.to_json()), span.name
+
+
+def test_span_to_dict_matches_to_json_for_non_recording_parent(exporter):
+    parent = trace_api.NonRecordingSpan(
+        SpanContext(trace_id=1, span_id=1, is_remote=True, trace_flags=TraceFlags(TraceFlags.SAMPLED))
+    )
+    memory = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(memory))
+    with provider.get_tracer(__name__).start_as_current_span(
+        "remote-child", context=trace_api.set_span_in_context(parent)
+    ):
+        pass
+    (span,) = memory.get_finished_spans()
+
+    assert exporter._span_to_dict(span) == json.loads(span.to_json())
@@ -12,15 +12,84 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
 import logging
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from typing import Any
 
+import orjson
 from google.cloud import logging as google_cloud_logging
-from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
+from opentelemetry import trace as trace_api
+from google.cloud.trace_v2 import TraceServiceClient
+from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter, _create_default_client
+from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import ReadableSpan
 from opentelemetry.sdk.trace.export import SpanExportResult
+from opentelemetry.sdk.util import ns_to_iso_str
+
+TRUNC_SUFFIX = "... [truncated]"
+
+# Given to CloudTraceSpanExporter.__init__ in place of a client so it doesn't build one eagerly
+_DEFERRED_CLIENT = object()
+
+# Sent once per write_entries call as the batch's default labels
+SPAN_LOG_LABELS = {
+    "type": "agent_telemetry",
+    "service_name": "researcher-agent",
+}
+
+
+def _estimate_json_size(attributes: dict) -> int | None:
+    """
+    Cheaply estimate the JSON-encoded size of span attributes without serializing them.
+
+    ASCII strings are counted by length and other strings at the UTF-8 worst case of 4 bytes
+    per character. Quotes and backslashes grow by at most 2x when escaped, so callers should only
+    trust estimates well below their limit. Strings with control characters, which JSON writes as
+    6-byte ``\\u00XX`` escapes, are not estimated.
+
+    :param attributes: The span attributes
+    :return: The estimated size in bytes, or None if a value cannot be sized cheaply
+    """
+    size = 2
+    for key, value in attributes.items():
+        if isinstance(value, str):
+            if not value.isprintable():
+                return None
+            size += len(key) + (len(value) if value.isascii() else 4 * len(value)) + 6
+        elif isinstance(value, (bool, int, float)) or value is None:
+            size += len(key) + 30
+        else:
+            return None
+    return size
+
+
+def _format_context(context: trace_api.SpanContext) -> dict[str, str]:
+    """
+    Format a span context the way ``ReadableSpan.to_json`` does.
+
+    :param context: The span context
+    :return: The context as a dictionary
+    """
+    return {
+        "trace_id": f"0x{trace_api.format_trace_id(context.trace_id)}",
+        "span_id": f"0x{trace_api.format_span_id(context.span_id)}",
+        "trace_state": repr(context.trace_state),
+    }
+
+
+def _format_attributes(attributes: Any) -> dict | None:
+    """
+    Copy span attributes into a plain dict, with sequences as lists as a JSON round-trip would give.
+
+    :param attributes: The span, event or link attributes
+    :return: The attributes as a dictionary, or None if there are none
+    """
+    if attributes is None:
+        return None
+    return {
+        key: list(value) if isinstance(value, tuple) else value
+        for key, value in attributes.items()
+    }
 
 
 class CloudTraceLoggingSpanExporter(CloudTraceSpanExporter):
@@ -35,6 +104,8 @@ class CloudTraceLoggingSpanExporter(CloudTraceSpanExporter):
         self,
         logging_client: google_cloud_logging.Client | None = None,
         debug: bool = False,
+        logging_client_factory: Callable[[], google_cloud_logging.Client] | None = None,
+        client: TraceServiceClient | None = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -42,14 +113,52 @@ class CloudTraceLoggingSpanExporter(CloudTraceSpanExporter):
 
         :param logging_client: Google Cloud Logging client
         :param debug: Enable debug mode for additional logging
+        :param logging_client_factory: Called on first export to get a shared client when
+            ``logging_client`` is not given
+        :param client: Cloud Trace client, created on first export when not given
         :param kwargs: Additional arguments to pass to the parent class
         """
-        super().__init__(**kwargs)
+        # The parent builds its gRPC client, which resolves credentials, unless it is given one
+        super().__init__(client=_DEFERRED_CLIENT, **kwargs)
+        self._client = client
         self.debug = debug
-        self.logging_client = logging_client or google_cloud_logging.Client(
-            project=self.project_id
-        )
-        self.logger = self.logging_client.logger(__name__)
+        self._trace_prefix = f"projects/{self.project_id}/traces/"
+        self.logging_client = logging_client
+        self._logging_client_factory = logging_client_factory
+        self._logger: google_cloud_logging.Logger | None = None
+        # Spans from one provider share a resource, so its dict is built once and reused
+        self._resource: Resource | None = None
+        self._resource_dict: dict | None = None
+
+    @property
+    def client(self) -> TraceServiceClient:
+        """
+        The Cloud Trace client, created on first use to keep credential lookup off startup.
+
+        :return: The client
+        """
+        if self._client is None:
+            self._client = _create_default_client()
+        return self._client
+
+    @client.setter
+    def client(self, client: TraceServiceClient) -> None:
+        self._client = client
+
+    @property
+    def logger(self) -> google_cloud_logging.Logger:
+        """
+        The Cloud Logging logger for span data, created on first use to keep client setup off startup.
+
+        :return: The logger
+        """
+        if self._logger is None:
+            if self.logging_client is None and self._logging_client_factory is not None:
+                self.logging_client = self._logging_client_factory()
+            if self.logging_client is None:
+                self.logging_client = google_cloud_logging.Client(project=self.project_id)
+            self._logger = self.logging_client.logger(__name__, labels=SPAN_LOG_LABELS)
+        return self._logger
 
     def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
         """
@@ -58,32 +167,79 @@ class CloudTraceLoggingSpanExporter(CloudTraceSpanExporter):
         :param spans: A sequence of spans to export
         :return: The result of the export operation
         """
+        # Queue every span's log entry and send them in a single write_entries RPC
+        batch = self.logger.batch()
         for span in spans:
             span_context = span.get_span_context()
-            trace_id = format(span_context.trace_id, "x")
-            span_id = format(span_context.span_id, "x")
-            span_dict = json.loads(span.to_json())
+            span_dict = self._span_to_dict(span)
 
-            span_dict["trace"] = f"projects/{self.project_id}/traces/{trace_id}"
-            span_dict["span_id"] = span_id
+            # W3C Trace Context IDs are fixed width: 32 hex chars for traces, 16 for spans
+            span_dict["trace"] = self._trace_prefix + format(span_context.trace_id, "032x")
+            span_dict["span_id"] = format(span_context.span_id, "016x")
 
             span_dict = self._process_large_attributes(span_dict)
 
             if self.debug:
                 print(span_dict)
 
-            # Log the span data to Google Cloud Logging
-            self.logger.log_struct(
+            # Batch entries don't pick up the logger's detected resource, so pass it explicitly
+            batch.log_struct(
                 span_dict,
-                labels={
-                    "type": "agent_telemetry",
-                    "service_name": "researcher-agent",
-                },
                 severity="INFO",
+                resource=self.logger.default_resource,
             )
+        # Log the span data to Google Cloud Logging
+        if batch.entries:
+            batch.commit()
         # Export spans to Google Cloud Trace using the parent class method
         return super().export(spans)
 
+    def _span_to_dict(self, span: ReadableSpan) -> dict:
+        """
+        Build the same dictionary as ``json.loads(span.to_json())`` directly from the span's fields.
+
+        This avoids serializing every span to JSON only to parse it straight back.
+
+        :param span: The span to convert
+        :return: The span data dictionary
+        """
+        if span.resource is not self._resource:
+            self._resource = span.resource
+            self._resource_dict = orjson.loads(span.resource.to_json())
+
+        status = {"status_code": span.status.status_code.name}
+        if span.status.description:
+            status["description"] = span.status.description
+
+        return {
+            "name": span.name,
+            "context": _format_context(span.context) if span.context else None,
+            "kind": str(span.kind),
+            "parent_id": (
+                f"0x{trace_api.format_span_id(span.parent.span_id)}" if span.parent is not None else None
+            ),
+            "start_time": ns_to_iso_str(span.start_time) if span.start_time else None,
+            "end_time": ns_to_iso_str(span.end_time) if span.end_time else None,
+            "status": status,
+            "attributes": _format_attributes(span.attributes),
+            "events": [
+                {
+                    "name": event.name,
+                    "timestamp": ns_to_iso_str(event.timestamp),
+                    "attributes": _format_attributes(event.attributes),
+                }
+                for event in span.events
+            ],
+            "links": [
+                {
+                    "context": _format_context(link.context),
+                    "attributes": _format_attributes(link.attributes),
+                }
+                for link in span.links
+            ],
+            "resource": self._resource_dict,
+        }
+
     def _process_large_attributes(self, span_dict: dict) -> dict:
         """
         Process large attribute values by truncating them if they exceed Cloud Logging size limits.
@@ -92,14 +248,21 @@ class CloudTraceLoggingSpanExporter(CloudTraceSpanExporter):
         :return: The updated span dictionary with truncated attributes if needed
         """
         attributes = span_dict["attributes"]
+        if not attributes:
+            return span_dict
         max_size = 200 * 1024  # 200 KB limit to stay well under Cloud Logging's 256KB limit
-        
-        if len(json.dumps(attributes).encode()) > max_size:
+
+        # Only serialize when the cheap estimate can't rule out an oversized payload
+        size = _estimate_json_size(attributes)
+        if size is None or size > max_size // 2:
+            size = len(orjson.dumps(attributes))
+
+        if size > max_size:
             # Truncate large attribute values
             truncated_attributes = {}
             for key, value in attributes.items():
-                if isinstance(value, str) and len(value.encode()) > 10000:  # 10KB per attribute
-                    truncated_value = value[:9900] + "... [truncated]"
+                if isinstance(value, str) and self._exceeds_attribute_limit(value):
+                    truncated_value = value[:9900] + TRUNC_SUFFIX
                     truncated_attributes[key] = truncated_value
                     logging.info(f"Truncated large attribute '{key}' to stay within logging limits")
                 else:
@@ -109,3 +272,20 @@ class CloudTraceLoggingSpanExporter(CloudTraceSpanExporter):
             logging.info("Processed large span attributes by truncating to fit Cloud Logging limits")
 
         return span_dict
+
+    @staticmethod
+    def _exceeds_attribute_limit(value: str, limit: int = 10000) -> bool:
+        """
+        Check whether a string attribute is larger than the 10KB per-attribute limit.
+
+        Character counts bound the UTF-8 size from both sides, so encoding is only needed in between.
+
+        :param value: The attribute value
+        :param limit: The size limit in bytes
+        :return: True if the encoded value exceeds the limit
+        """
+        if len(value) > limit:
+            return True
+        if value.isascii() or 4 * len(value) <= limit:
+            return False
+        return len(value.encode()) > limit